@@ -5,21 +5,27 @@ keyboard_automation.py
 Automates browser interactions via keystrokes and AppleScript.
 Uploads files in batches (default size 3), runs prompt JS, then for each batch:
 - Waits while randomly switching tabs 2..N (3–7s delay, visit-any-within-30s policy),
-- Downloads results (starting at tab 2), verifying success via spacers,
+- Downloads results (starting at tab 2), watching ~/Downloads for each new file,
 - Marks failures with 'error_<filename>.txt' in the output folder,
 - Closes the batch tabs (ensuring we go to tab 2 before closing).
 
-Also creates 'spacer' marker files at start in ~/Downloads to track new downloads.
+Each download is tied to its tab by the new ~/Downloads entry that appears
+after the click, so nothing is written there beforehand.
 """
 
 import subprocess
 import time
 import random
-import pyperclip
 import os
 import shutil
-from itertools import islice
+import atexit
+import tempfile
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, islice
 import sys
+from watchfiles import watch
 
 # ---------------- CONFIG ----------------
 
@@ -40,6 +46,10 @@ OUTPUT_FOLDER = os.path.join(PROJECT_ROOT, "out")
 
 ENABLE_DOWNLOADS = True
 DOWNLOADS_FOLDER = os.path.expanduser("~/Downloads")
+DOWNLOAD_TIMEOUT = 30  # seconds to wait for a clicked download to land
+DOWNLOAD_START_TIMEOUT = 15  # seconds for a click to produce any Downloads entry
+DOWNLOAD_STABLE_SECONDS = 0.5  # a finished file's size must hold this long
+DOWNLOAD_CLICK_GAP = (0.8, 1.6)  # pause between back-to-back download clicks
 
 # Batch control
 BATCH_SIZE = 3
@@ -50,6 +60,12 @@ TAB_SWITCH_MIN_DELAY = 3
 TAB_SWITCH_MAX_DELAY = 7
 TAB_VISIT_MAX_AGE = 30
 
+# Waiting for ChatGPT to accept a submitted prompt
+UPLOAD_ACK_PREFIX = "UPLOAD_OK_"
+UPLOAD_ACK_TIMEOUT = 20
+UPLOAD_ACK_POLL = 0.5
+UPLOAD_ACK_HOLD = 60  # seconds the page keeps the title marker in place
+
 # Timing for micro-delays
 MIN_DELAY = 0.12
 MAX_DELAY = 0.45
@@ -94,43 +110,192 @@ PROMPT_JS_TEMPLATE = r"""
 })();
 """
 
+PROMPT_TEXT = (
+    "Apply the artistic style, color palette, and texture of the second image "
+    "to the first image while keeping its structure. "
+    "Don't be afraid to vary colours and keep the colours more realistically "
+    "similar to the first image. This image must be square."
+)
+
+# Pasted together with the prompt. Once our message shows up in the thread
+# it stamps the tab title for wait_for_upload_ack(), and keeps re-stamping it
+# (ChatGPT retitles the tab when it opens the conversation) for a while so the
+# marker is still there when Python polls.
+UPLOAD_ACK_JS = r"""
+(() => {
+  const prefix = "{ACK_PREFIX}";
+  let mark = null;
+  const keep = new MutationObserver(() => {
+    if (document.title !== mark) document.title = mark;
+  });
+  const sent = new MutationObserver(() => {
+    if (!document.querySelector('[data-message-author-role="user"]')) return;
+    sent.disconnect();
+    mark = prefix + Date.now();
+    document.title = mark;
+    keep.observe(document.head, { childList: true, characterData: true, subtree: true });
+    setTimeout(() => keep.disconnect(), {ACK_HOLD_MS});
+  });
+  sent.observe(document.body, { childList: true, subtree: true });
+  // don't keep watching a generating tab if the submit never happened
+  setTimeout(() => sent.disconnect(), {ACK_TIMEOUT_MS});
+})();
+"""
+
+# Same for every file, so built once
+PROMPT_JS_READY = (
+    PROMPT_JS_TEMPLATE.replace("{PROMPT_TEXT}", PROMPT_TEXT.replace("`", "\\`"))
+    + UPLOAD_ACK_JS.replace("{ACK_PREFIX}", UPLOAD_ACK_PREFIX)
+    .replace("{ACK_HOLD_MS}", str(UPLOAD_ACK_HOLD * 1000))
+    .replace("{ACK_TIMEOUT_MS}", str(UPLOAD_ACK_TIMEOUT * 1000))
+)
+
 CLICK_BUTTON_JS = r"""document.querySelector('#composer-submit-button').click()"""
 
+DOWNLOAD_BUTTON_JS = r"""document.querySelector("span:nth-child(3) > button").click()"""
+
 # ---------------- APPLESCRIPT HELPERS ----------------
 
+# One interactive osascript kept alive for the whole run; every command is
+# streamed to it as a single line instead of forking a new interpreter.
+_OSA = None
+
+# osa_sync() has the co-process create a marker file, so the handshake does
+# not depend on how osascript buffers its stdout when it isn't a terminal
+_OSA_SYNC_TIMEOUT = 10
+_OSA_SYNC_POLL = 0.01
+_osa_sync_ids = count()
+
+def _osa_process():
+    global _OSA
+    if _OSA is None or _OSA.poll() is not None:
+        _OSA = subprocess.Popen(
+            ["osascript", "-i"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            bufsize=1,
+            text=True,
+        )
+    return _OSA
+
+def _close_osa():
+    if _OSA is not None:
+        try:
+            _OSA.stdin.close()
+            _OSA.wait(timeout=5)
+        except Exception:
+            _OSA.kill()
+
+atexit.register(_close_osa)
+
+def as_string(s):
+    """Quote s as a single-line AppleScript string literal."""
+    escaped = s.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
 def osa(cmd):
-    subprocess.run(["osascript", "-e", cmd])
+    cmd = cmd.strip()
+    if "\n" in cmd:
+        # interactive mode reads one line at a time
+        cmd = f"run script {as_string(cmd)}"
+    proc = _osa_process()
+    proc.stdin.write(cmd + "\n")
+    proc.stdin.flush()
+
+def osa_sync(timeout=_OSA_SYNC_TIMEOUT):
+    """Block until every command already sent to the co-process has run.
+
+    Call before anything that acts outside the co-process (another osascript,
+    the clipboard) so queued keystrokes can't land after it.
+    """
+    if _OSA is None or _OSA.poll() is not None:
+        return
+    marker = os.path.join(
+        tempfile.gettempdir(), f"gpt_osa_sync_{os.getpid()}_{next(_osa_sync_ids)}"
+    )
+    osa(f"close access (open for access POSIX file {as_string(marker)} with write permission)")
+    deadline = time.time() + timeout
+    while not os.path.exists(marker):
+        if time.time() >= deadline:
+            print("⚠️ AppleScript co-process did not catch up in time.")
+            return
+        time.sleep(_OSA_SYNC_POLL)
+    os.remove(marker)
+
+def pbcopy(text):
+    """Set the clipboard synchronously, so it is ready before the next paste."""
+    osa_sync()
+    # pbcopy decodes stdin using the locale; the prompt JS contains emoji
+    env = {**os.environ, "LC_CTYPE": "UTF-8"}
+    subprocess.run(["pbcopy"], input=text.encode("utf-8"), env=env)
+
+def run_script(src):
+    """Run a multi-statement AppleScript in one osascript call and wait for it."""
+    osa_sync()
+    subprocess.run(["osascript", "-"], input=src, text=True)
+
+# System Events statements shared by the helpers and the batched upload script
+KEY_PASTE = 'keystroke "v" using {command down}'
+KEY_ENTER = "key code 36"
+KEY_DOWN = "key code 125"
+KEY_NEW_TAB = 'keystroke "t" using {command down}'
+KEY_DEVTOOLS = 'keystroke "j" using {command down, option down}'
+KEY_CLOSE_TAB = 'keystroke "w" using {command down}'
+
+TAB_TITLE_SCRIPT = 'tell application "Google Chrome" to return title of active tab of window 1'
+
+def chrome_new_tab(url):
+    """Statement that opens url in a new tab of Chrome's front window."""
+    return (
+        'tell application "Google Chrome" to tell window 1 to '
+        f"make new tab with properties {{URL:{as_string(url)}}}"
+    )
 
-def sleep():
-    time.sleep(random.uniform(MIN_DELAY, MAX_DELAY))
+def osa_output(cmd):
+    """Run an AppleScript in its own osascript call and return its result."""
+    osa_sync()
+    result = subprocess.run(["osascript", "-e", cmd], capture_output=True, text=True)
+    return result.stdout.strip()
 
-def paste_clipboard():
-    osa('tell application "System Events" to keystroke "v" using {command down}')
-    sleep()
+def key_type(text):
+    """System Events statement that types text directly, bypassing the clipboard."""
+    return f"keystroke {as_string(text)}"
 
-def press_enter():
-    osa('tell application "System Events" to key code 36')
-    sleep()
+def jitter_seconds(n=1):
+    """One random pause spanning n micro-delays (n * MIN_DELAY .. n * MAX_DELAY)."""
+    return MIN_DELAY * n + random.random() * (MAX_DELAY - MIN_DELAY) * n
 
-def press_down(short=False):
-    osa('tell application "System Events" to key code 125')
-    time.sleep(0.07 if short else 0.5)
+def as_delay(n=1):
+    """AppleScript counterpart of jitter(n)."""
+    return f"delay {jitter_seconds(n):.3f}"
 
-def cmd_t():
-    osa('tell application "System Events" to keystroke "t" using {command down}')
-    sleep()
+def build_upload_script(steps):
+    """Wrap upload steps (keystrokes, delays, Chrome commands) in one System Events block."""
+    body = "\n".join(f"    {step}" for step in steps)
+    return f'tell application "System Events"\n{body}\nend tell'
+
+def jitter(n=1):
+    time.sleep(jitter_seconds(n))
+
+def type_text(text):
+    osa(f'tell application "System Events" to {key_type(text)}')
+    jitter()
 
-def open_devtools():
-    osa('tell application "System Events" to keystroke "j" using {command down, option down}')
-    sleep()
+def press_enter():
+    osa(f'tell application "System Events" to {KEY_ENTER}')
+    jitter()
+
+def cmd_t():
+    osa(f'tell application "System Events" to {KEY_NEW_TAB}')
+    jitter()
 
 def cmd_digit(n: int):
     osa(f'tell application "System Events" to keystroke "{n}" using {{command down}}')
-    sleep()
+    jitter()
 
 def cmd_w():
-    osa('tell application "System Events" to keystroke "w" using {command down}')
-    sleep()
+    osa(f'tell application "System Events" to {KEY_CLOSE_TAB}')
+    jitter()
 
 # ---------------- FILESYSTEM HELPERS ----------------
 
@@ -149,35 +314,39 @@ def close_all_chrome_tabs_and_open_new():
 
 
 def wipe_tmp_upload():
-    if not os.path.exists(TEMP_UPLOAD_DIR):
-        os.makedirs(TEMP_UPLOAD_DIR, exist_ok=True)
-        return
-
-    for f in os.listdir(TEMP_UPLOAD_DIR):
-        try:
-            path = os.path.join(TEMP_UPLOAD_DIR, f)
-            if os.path.isfile(path) or os.path.islink(path):
-                os.remove(path)
-            elif os.path.isdir(path):
-                shutil.rmtree(path)
-        except Exception as e:
-            print(f"⚠️ Could not remove {f}: {e}")
+    try:
+        shutil.rmtree(TEMP_UPLOAD_DIR)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        # e.g. tmp_upload is itself a symlink: clear its contents instead
+        for f in os.listdir(TEMP_UPLOAD_DIR):
+            try:
+                path = os.path.join(TEMP_UPLOAD_DIR, f)
+                if os.path.isfile(path) or os.path.islink(path):
+                    os.remove(path)
+                elif os.path.isdir(path):
+                    shutil.rmtree(path)
+            except Exception as e:
+                print(f"⚠️ Could not remove {f}: {e}")
+    os.makedirs(TEMP_UPLOAD_DIR, exist_ok=True)
 
     print(f"[i] Cleared tmp_upload folder: {TEMP_UPLOAD_DIR}")
 
 
 def copy_initial_style():
-    style_dir = STYLE_FOLDER   # <-- FIXED
-    files = sorted([
-        f for f in os.listdir(style_dir)
-        if os.path.isfile(os.path.join(style_dir, f)) and not f.startswith(".")
-    ])
-    if not files:
+    with os.scandir(STYLE_FOLDER) as it:
+        first = min(
+            (e for e in it if e.is_file() and not e.name.startswith(".")),
+            key=lambda e: e.name,
+            default=None,
+        )
+    if first is None:
         print("⚠️ No style files found.")
         return None
 
-    first_file = files[0]
-    src = os.path.join(style_dir, first_file)
+    first_file = first.name
+    src = first.path
     ext = os.path.splitext(first_file)[1]
     dest = os.path.join(TEMP_UPLOAD_DIR, "zzzzzz_style" + ext)
 
@@ -189,46 +358,116 @@ def copy_initial_style():
 
 
 
-def create_download_spacers(count=20):
-    """Create 'spacer' empty files to mark the Downloads folder before downloads."""
-    os.makedirs(DOWNLOADS_FOLDER, exist_ok=True)
-    for i in range(count):
-        path = os.path.join(DOWNLOADS_FOLDER, f"spacer_{i+1:04d}.tmp")
-        with open(path, "w"):
-            pass
-    print(f"[i] Created {count} spacer files in {DOWNLOADS_FOLDER}")
-
-def cleanup_download_spacers():
-    """Remove all spacer_XXXX.tmp files."""
-    removed = 0
-    for f in os.listdir(DOWNLOADS_FOLDER):
-        if f.startswith("spacer_") and f.endswith(".tmp"):
-            try:
-                os.remove(os.path.join(DOWNLOADS_FOLDER, f))
-                removed += 1
-            except Exception as e:
-                print(f"⚠️ Could not remove {f}: {e}")
-    print(f"[i] Cleaned up {removed} spacer files from {DOWNLOADS_FOLDER}")
-
-def get_latest_spacer_time():
-    """Return the newest spacer file modification time."""
-    spacers = [
-        os.path.join(DOWNLOADS_FOLDER, f)
-        for f in os.listdir(DOWNLOADS_FOLDER)
-        if f.startswith("spacer_") and f.endswith(".tmp")
-    ]
-    if not spacers:
-        return 0
-    return max(os.path.getmtime(f) for f in spacers)
-
-def download_is_success(timestamp):
-    """Count how many files in Downloads are newer than the given timestamp."""
-    files = [
-        os.path.join(DOWNLOADS_FOLDER, f)
-        for f in os.listdir(DOWNLOADS_FOLDER)
-        if os.path.isfile(os.path.join(DOWNLOADS_FOLDER, f)) and not f.startswith(".")
-    ]
-    return sum(os.path.getmtime(f) > timestamp for f in files) > 0
+def download_entries():
+    """Visible regular files in ~/Downloads as DirEntry objects (stat is cached)."""
+    with os.scandir(DOWNLOADS_FOLDER) as it:
+        for e in it:
+            if not e.name.startswith(".") and e.is_file(follow_symlinks=False):
+                yield e
+
+PARTIAL_SUFFIXES = (".crdownload", ".part")
+
+def download_name(name):
+    """Final name of a download, whether or not it is still in progress."""
+    for suffix in PARTIAL_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+class DownloadTracker:
+    """Ties each clicked download to the file it produces in ~/Downloads.
+
+    A download is claimed by name as soon as any entry for it appears (its
+    .crdownload/.part or the final file), so every tab gets its own file.
+    It counts as finished once the final file has no in-progress sibling and
+    its size has not changed for DOWNLOAD_STABLE_SECONDS.
+    """
+
+    def __init__(self):
+        self.known = {download_name(e.name) for e in download_entries()}
+        self.samples = {}  # name -> (size, monotonic time that size was first seen)
+
+    def claim_new(self):
+        """Name of a download that appeared since the last claim, or None."""
+        for e in download_entries():
+            # Chrome renames these once it knows the real file name
+            if e.name.startswith("Unconfirmed "):
+                continue
+            name = download_name(e.name)
+            if name not in self.known:
+                self.known.add(name)
+                return name
+        return None
+
+    def wait_for_start(self, timeout=DOWNLOAD_START_TIMEOUT):
+        """Block until a just-clicked download shows up; its name, or None."""
+        name = self.claim_new()
+        if name:
+            return name
+        stop = threading.Event()
+        timer = threading.Timer(timeout, stop.set)
+        timer.start()
+        try:
+            for _ in watch(DOWNLOADS_FOLDER, stop_event=stop, recursive=False,
+                           rust_timeout=500, yield_on_timeout=True):
+                name = self.claim_new()
+                if name:
+                    return name
+        finally:
+            timer.cancel()
+        return None
+
+    def finished_path(self, name, entries):
+        """Path of the download once it has finished, else None.
+
+        entries maps names to DirEntry objects from one scan of ~/Downloads.
+        """
+        if name not in entries:
+            return None
+        if any(name + suffix in entries for suffix in PARTIAL_SUFFIXES):
+            return None
+        size = entries[name].stat().st_size
+        now = time.monotonic()
+        seen = self.samples.get(name)
+        if seen is None or seen[0] != size:
+            self.samples[name] = (size, now)
+            return None
+        return entries[name].path if now - seen[1] >= DOWNLOAD_STABLE_SECONDS else None
+
+def wait_for_downloads(tracker, names, timeout=DOWNLOAD_TIMEOUT):
+    """Wait for every started download to finish, all served by one watcher.
+
+    Returns paths in the order of names; None where a download never started
+    or did not finish within timeout.
+    """
+    paths = [None] * len(names)
+    pending = {i for i, name in enumerate(names) if name}
+
+    def check():
+        entries = {e.name: e for e in download_entries()}
+        for i in list(pending):
+            path = tracker.finished_path(names[i], entries)
+            if path:
+                paths[i] = path
+                pending.discard(i)
+
+    check()
+    if not pending:
+        return paths
+    stop = threading.Event()
+    timer = threading.Timer(timeout, stop.set)
+    timer.start()
+    try:
+        # yield_on_timeout re-checks twice a second so sizes get confirmed
+        # even when nothing else changes
+        for _ in watch(DOWNLOADS_FOLDER, stop_event=stop, recursive=False,
+                       rust_timeout=500, yield_on_timeout=True):
+            check()
+            if not pending:
+                break
+    finally:
+        timer.cancel()
+    return paths
 
 def mark_download_error(filename):
     """Create an error_<filename>.txt file in OUTPUT_FOLDER."""
@@ -239,22 +478,13 @@ def mark_download_error(filename):
         f.write("An error occurred for this file during download.\n")
     print(f"❌ Download failed: {filename} — wrote {error_path}")
 
-def move_latest_download(target_name):
-    """Move the most recent file from ~/Downloads to OUTPUT_FOLDER."""
-    files = [
-        os.path.join(DOWNLOADS_FOLDER, f)
-        for f in os.listdir(DOWNLOADS_FOLDER)
-        if os.path.isfile(os.path.join(DOWNLOADS_FOLDER, f)) and not f.startswith(".")
-    ]
-    if not files:
-        print("⚠️ No downloads found.")
-        return
-    latest = max(files, key=os.path.getctime)
+def move_download(path, target_name):
+    """Move a downloaded file from ~/Downloads to OUTPUT_FOLDER."""
     os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-    ext = os.path.splitext(latest)[1]
+    ext = os.path.splitext(path)[1]
     dest = os.path.join(OUTPUT_FOLDER, target_name + ext)
     try:
-        os.rename(latest, dest)
+        os.rename(path, dest)
         print(f"✅ Saved {dest}")
     except Exception as e:
         print(f"⚠️ Could not move download: {e}")
@@ -275,7 +505,12 @@ def focus_chrome():
     """)
 
 def add_base_image(path):
-    shutil.copy2(path, TEMP_UPLOAD_DIR)
+    dest = os.path.join(TEMP_UPLOAD_DIR, os.path.basename(path))
+    try:
+        # same filesystem: a hardlink avoids copying the image bytes
+        os.link(path, dest)
+    except OSError:
+        shutil.copy2(path, dest)
     print(f"[i] Added {os.path.basename(path)} to temp folder.")
 
 def cleanup_base_image(path):
@@ -284,37 +519,42 @@ def cleanup_base_image(path):
         os.remove(target)
         print(f"[i] Removed {os.path.basename(path)} from temp folder.")
 
-def chunked(iterable, size):
-    it = iter(iterable)
-    while True:
-        chunk = list(islice(it, size))
-        if not chunk:
-            return
-        yield chunk
+try:
+    from itertools import batched  # Python 3.12+
+except ImportError:
+    def batched(iterable, size):
+        it = iter(iterable)
+        while True:
+            chunk = tuple(islice(it, size))
+            if not chunk:
+                return
+            yield chunk
 
 def rotate_tabs_humanly(tabs):
     if not tabs:
         return
     current = tabs[0]
     cmd_digit(current)
-    last_visit = {t: 0 for t in tabs}
-    last_visit[current] = time.time()
+    visited_at = time.time()
+    # (last_visit, tab) for every tab except the current one, oldest on top
+    waiting = [(0, t) for t in tabs if t != current]
+    heapq.heapify(waiting)
 
     end_time = time.time() + BATCH_WAIT_SECONDS
     while time.time() < end_time:
-        if len(tabs) > 1:
-            now = time.time()
-            candidates = [t for t in tabs if t != current]
-            overdue = [t for t in candidates if (now - last_visit.get(t, 0)) >= TAB_VISIT_MAX_AGE]
-
-            if overdue:
-                nxt = random.choice(overdue)
+        if waiting:
+            if time.time() - waiting[0][0] >= TAB_VISIT_MAX_AGE:
+                _, nxt = heapq.heappop(waiting)
             else:
-                nxt = random.choice(candidates)
+                i = random.randrange(len(waiting))
+                _, nxt = waiting[i]
+                waiting[i] = waiting[-1]
+                waiting.pop()
+                heapq.heapify(waiting)
 
             cmd_digit(nxt)
-            last_visit[nxt] = time.time()
-            current = nxt
+            heapq.heappush(waiting, (visited_at, current))
+            current, visited_at = nxt, time.time()
 
             time.sleep(random.uniform(TAB_SWITCH_MIN_DELAY, TAB_SWITCH_MAX_DELAY))
         else:
@@ -324,68 +564,78 @@ def rotate_tabs_humanly(tabs):
 
 def upload_one_file(base_image_path):
     add_base_image(base_image_path)
-    cmd_t()
-    pyperclip.copy(URL)
-    paste_clipboard()
-    press_enter()
-    sleep(); sleep()
-    open_devtools()
-    sleep(); sleep(); sleep()
-
-    pyperclip.copy(OPEN_INPUT_JS)
-    paste_clipboard(); sleep(); sleep(); press_enter()
-    time.sleep(0.8)
-    press_down(True); press_enter()
-    sleep(); sleep(); sleep()
-
-    pyperclip.copy(OPEN_INPUT_JS)
-    paste_clipboard(); sleep(); sleep(); press_enter()
-    time.sleep(0.7)
-    press_down(); time.sleep(0.7); press_down(); time.sleep(0.3); press_enter()
-    sleep(); sleep(); sleep()
-
-    prompt_text = (
-        "Apply the artistic style, color palette, and texture of the second image "
-        "to the first image while keeping its structure. "
-        "Don't be afraid to vary colours and keep the colours more realistically "
-        "similar to the first image. This image must be square."
-    )
-    js = PROMPT_JS_TEMPLATE.replace("{PROMPT_TEXT}", prompt_text.replace("`", "\\`"))
-    pyperclip.copy(js)
-    paste_clipboard(); sleep(); sleep(); sleep(); sleep(); press_enter()
-    sleep(); sleep(); sleep()
-    pyperclip.copy(CLICK_BUTTON_JS)
-    paste_clipboard(); sleep(); sleep(); sleep(); press_enter()
+
+    # Chrome opens the tab straight at URL and the short submit JS is typed;
+    # the clipboard only carries the larger payloads, so each file needs two
+    # osascript calls.
+    pbcopy(OPEN_INPUT_JS)
+    run_script(build_upload_script([
+        chrome_new_tab(URL), as_delay(3),
+        KEY_DEVTOOLS, as_delay(4),
+
+        KEY_PASTE, as_delay(3), KEY_ENTER, as_delay(),
+        "delay 0.8",
+        KEY_DOWN, "delay 0.07", KEY_ENTER, as_delay(4),
+
+        KEY_PASTE, as_delay(3), KEY_ENTER, as_delay(),
+        "delay 0.7",
+        KEY_DOWN, "delay 1.2",
+        KEY_DOWN, "delay 0.8",
+        KEY_ENTER, as_delay(4),
+    ]))
+
+    pbcopy(PROMPT_JS_READY)
+    run_script(build_upload_script([
+        KEY_PASTE, as_delay(5), KEY_ENTER, as_delay(4),
+        key_type(CLICK_BUTTON_JS), as_delay(4), KEY_ENTER, as_delay(),
+    ]))
     cleanup_base_image(base_image_path)
-    time.sleep(random.uniform(8.6, 10 + random.gauss(6, 1)))
+    if not wait_for_upload_ack():
+        print(f"⚠️ No submit confirmation within {UPLOAD_ACK_TIMEOUT}s, moving on.")
+    jitter(2)
+
+def wait_for_upload_ack(timeout=UPLOAD_ACK_TIMEOUT):
+    """Poll the active tab's title for the marker set by UPLOAD_ACK_JS."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if osa_output(TAB_TITLE_SCRIPT).startswith(UPLOAD_ACK_PREFIX):
+            return True
+        time.sleep(UPLOAD_ACK_POLL)
+    return False
 
 def download_for_batch(batch_files):
     if not ENABLE_DOWNLOADS:
         return
     cmd_digit(2)
-    latest_spacer_time = get_latest_spacer_time()
     failed_count = 0
     completed_downloads = 0
 
+    # Clicks need keyboard focus so they stay serial, and each one waits for
+    # its download to appear so it can be claimed for this tab. Only the
+    # waits for the downloads to finish overlap.
+    tracker = DownloadTracker()
+    names = []
     for i, filename in enumerate(batch_files):
         base_name, _ = os.path.splitext(filename)
         print(f"[i] Downloading result for: {base_name}")
         cmd_digit(2 + i)
-        pyperclip.copy('document.querySelector("span:nth-child(3) > button").click()')
-        paste_clipboard(); press_enter()
-        time.sleep(5 + random.uniform(1, 3))
+        type_text(DOWNLOAD_BUTTON_JS)
+        press_enter()
+        osa_sync()
+        names.append(tracker.wait_for_start())
+        time.sleep(random.uniform(*DOWNLOAD_CLICK_GAP))
+
+    paths = wait_for_downloads(tracker, names)
 
-        # Check new files count
-        success = download_is_success(latest_spacer_time)
-        if not success:
+    for filename, path in zip(batch_files, paths):
+        base_name, _ = os.path.splitext(filename)
+        if path is None:
             mark_download_error(filename)
             failed_count += 1
         else:
-            move_latest_download(base_name)
+            move_download(path, base_name)
             completed_downloads += 1
 
-        time.sleep(5)
-
 def close_batch_tabs(batch_count):
     if batch_count <= 0:
         return
@@ -396,22 +646,30 @@ def close_batch_tabs(batch_count):
 
 # ---------------- MAIN ----------------
 
-def main():
+def prepare_folders():
+    # the style copy lands in tmp_upload, so it must follow the wipe
     wipe_tmp_upload()
+    copy_initial_style()
+    os.makedirs(DOWNLOADS_FOLDER, exist_ok=True)
+
+def prepare_chrome():
     focus_chrome()
     close_all_chrome_tabs_and_open_new()
-    create_download_spacers()
-    copy_initial_style()
 
-    files = sorted([
-        f for f in os.listdir(FILES_FOLDER)
-        if os.path.isfile(os.path.join(FILES_FOLDER, f)) and not f.startswith(".")
-    ])
+def main():
+    # Folder setup and Chrome setup don't depend on each other
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        futures = [ex.submit(prepare_folders), ex.submit(prepare_chrome)]
+        for future in futures:
+            future.result()
+
+    with os.scandir(FILES_FOLDER) as it:
+        files = sorted(e.name for e in it if e.is_file() and not e.name.startswith("."))
     print(f"[i] Found {len(files)} files.")
     print("[i] Starting in 5 seconds...")
     time.sleep(5)
 
-    for batch_index, batch in enumerate(chunked(files, BATCH_SIZE), start=1):
+    for batch_index, batch in enumerate(batched(files, BATCH_SIZE), start=1):
         print(f"\n========== BATCH {batch_index} ({len(batch)} file(s)) ==========")
         for index, filename in enumerate(batch, start=1):
             base_image_path = os.path.join(FILES_FOLDER, filename)
@@ -428,7 +686,6 @@ def main():
             close_batch_tabs(len(batch))
         print(f"✅ Finished BATCH {batch_index}.\n")
 
-    cleanup_download_spacers()
     print("✅ All batches complete. Done.")
 
 if __name__ == "__main__":
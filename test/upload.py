@@ -21,13 +21,12 @@ ZERO browser logic. All it does is send keystrokes:
 - Repeat for each run
 
 All keystrokes are done using AppleScript (osascript).
-Clipboard is set using pyperclip.
+Clipboard is set using pbcopy.
 """
 
 import subprocess
 import time
 import random
-import pyperclip
 import os
 
 # ---------------- CONFIG ----------------
@@ -103,6 +102,12 @@ def osa(cmd):
     subprocess.run(["osascript", "-e", cmd])
 
 
+def pbcopy(text):
+    """Set the clipboard (pbcopy decodes stdin using the locale)."""
+    env = {**os.environ, "LC_CTYPE": "UTF-8"}
+    subprocess.run(["pbcopy"], input=text.encode("utf-8"), env=env)
+
+
 def sleep():
     time.sleep(random.uniform(MIN_DELAY, MAX_DELAY))
 
@@ -155,7 +160,7 @@ def main():
         cmd_t()
 
         # 2. Paste URL
-        pyperclip.copy(URL)
+        pbcopy(URL)
         paste_clipboard()
         press_enter()
 
@@ -170,7 +175,7 @@ def main():
         sleep()
 
         # 4. Paste OPEN_INPUT_JS
-        pyperclip.copy(OPEN_INPUT_JS)
+        pbcopy(OPEN_INPUT_JS)
         paste_clipboard()
         sleep()
         sleep()
@@ -191,7 +196,7 @@ def main():
 
         # 8. Paste OPEN_INPUT_JS again (for second image)
         # open_devtools()
-        pyperclip.copy(OPEN_INPUT_JS)
+        pbcopy(OPEN_INPUT_JS)
         paste_clipboard()
         sleep()
         sleep()
@@ -210,7 +215,7 @@ def main():
         prompt_text = f"Apply the artistic style, color palette, and texture of the second image to the first image while keeping its structure. Don't be afraid to vary colours and keep the colours more realistically similar to the first image. This image must be square."
         js = PROMPT_JS_TEMPLATE.replace("{PROMPT_TEXT}", prompt_text.replace("`", "\\`"))
         # open_devtools()
-        pyperclip.copy(js)
+        pbcopy(js)
         paste_clipboard()
         sleep()
         sleep()
@@ -223,7 +228,7 @@ def main():
         sleep()
         sleep()
         sleep()
-        pyperclip.copy(CLICK_BUTTON_JS)
+        pbcopy(CLICK_BUTTON_JS)
         paste_clipboard()
         sleep()
         sleep()